@@ -1,297 +1,370 @@
-import csv
-import importlib
-import io
-from datetime import datetime
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy import func
-from sqlalchemy.orm import Session, selectinload
-
-from .. import schemas
-from ..deps import get_db, require_admin
-from ..models import AdminNotification, Report, ShoutOut, ShoutOutRecipient, User
-
-router = APIRouter()
-
-
-@router.get("/metrics", response_model=schemas.AdminMetrics)
-def get_admin_metrics(
-    db: Session = Depends(get_db),
-    _: User = Depends(require_admin),
-) -> schemas.AdminMetrics:
-    top_contributors = (
-        db.query(User, func.count(ShoutOut.id).label("count"))
-        .join(ShoutOut, ShoutOut.created_by_id == User.id)
-        .group_by(User.id)
-        .order_by(func.count(ShoutOut.id).desc())
-        .limit(5)
-        .all()
-    )
-    most_tagged = (
-        db.query(User, func.count(ShoutOutRecipient.shoutout_id).label("count"))
-        .join(ShoutOutRecipient, ShoutOutRecipient.user_id == User.id)
-        .group_by(User.id)
-        .order_by(func.count(ShoutOutRecipient.shoutout_id).desc())
-        .limit(5)
-        .all()
-    )
-    return schemas.AdminMetrics(
-        top_contributors=[
-            schemas.UserStat(user=user, count=count) for user, count in top_contributors
-        ],
-        most_tagged=[
-            schemas.UserStat(user=user, count=count) for user, count in most_tagged
-        ],
-    )
-
-
-def _validate_status_filter(status_filter: Optional[str]) -> None:
-    if status_filter and status_filter not in {"open", "resolved"}:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Status must be 'open' or 'resolved'",
-        )
-
-
-def _base_report_query(db: Session):
-    q = db.query(Report).options(
-        selectinload(Report.shoutout)
-        .selectinload(ShoutOut.created_by),
-        selectinload(Report.reporter),
-        selectinload(Report.resolved_by),
-    )
-    return q
-
-
-@router.get("/reports", response_model=List[schemas.ReportOut])
-def list_reports(
-    status_filter: Optional[str] = Query(None, alias="status"),
-    db: Session = Depends(get_db),
-    _: User = Depends(require_admin),
-) -> List[schemas.ReportOut]:
-    _validate_status_filter(status_filter)
-    q = _base_report_query(db)
-    if status_filter:
-        q = q.filter(Report.status == status_filter)
-    reports = q.order_by(Report.created_at.desc()).all()
-    return reports
-
-
-@router.get("/notifications", response_model=List[schemas.AdminNotificationOut])
-def list_admin_notifications(
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-    event_type: Optional[str] = Query(None, alias="type"),
-    db: Session = Depends(get_db),
-    _: User = Depends(require_admin),
-) -> List[schemas.AdminNotificationOut]:
-    query = (
-        db.query(AdminNotification)
-        .options(selectinload(AdminNotification.actor))
-        .order_by(AdminNotification.created_at.desc())
-    )
-    if event_type:
-        query = query.filter(AdminNotification.event_type == event_type)
-    notifications = query.offset(offset).limit(limit).all()
-    return notifications
-
-
-@router.post("/reports/{report_id}/resolve", response_model=schemas.ReportOut)
-def resolve_report(
-    report_id: int,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(require_admin),
-) -> schemas.ReportOut:
-    report = (
-        db.query(Report)
-        .options(
-            selectinload(Report.shoutout).selectinload(ShoutOut.created_by),
-            selectinload(Report.reporter),
-            selectinload(Report.resolved_by),
-        )
-        .filter(Report.id == report_id)
-        .first()
-    )
-    if not report:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
-    if report.status == "resolved":
-        return report
-    report.status = "resolved"
-    report.resolved_at = datetime.utcnow()
-    report.resolved_by_id = admin_user.id
-    db.commit()
-    report = (
-        db.query(Report)
-        .options(
-            selectinload(Report.shoutout).selectinload(ShoutOut.created_by),
-            selectinload(Report.reporter),
-            selectinload(Report.resolved_by),
-        )
-        .filter(Report.id == report_id)
-        .first()
-    )
-    return report
-
-
-@router.get("/reports/export")
-def export_reports(
-    format: str = Query("csv", pattern="^(csv|pdf)$"),
-    status_filter: Optional[str] = Query(None, alias="status"),
-    db: Session = Depends(get_db),
-    _: User = Depends(require_admin),
-):
-    _validate_status_filter(status_filter)
-    q = _base_report_query(db)
-    if status_filter:
-        q = q.filter(Report.status == status_filter)
-    reports = q.order_by(Report.created_at.desc()).all()
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-
-    if format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
-                "Report ID",
-                "Status",
-                "Reporter",
-                "Reason",
-                "Shout-Out ID",
-                "Shout-Out Author",
-                "Reported At",
-                "Resolved At",
-            ]
-        )
-        for report in reports:
-            writer.writerow(
-                [
-                    report.id,
-                    report.status,
-                    report.reporter.full_name,
-                    report.reason or "",
-                    report.shoutout.id,
-                    report.shoutout.created_by.full_name,
-                    report.created_at.isoformat(),
-                    report.resolved_at.isoformat() if report.resolved_at else "",
-                ]
-            )
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=reports-{timestamp}.csv"
-            },
-        )
-
-    # PDF export
-    try:
-        pdfgen_module = importlib.import_module("reportlab.pdfgen.canvas")
-        pagesizes_module = importlib.import_module("reportlab.lib.pagesizes")
-        utils_module = importlib.import_module("reportlab.lib.utils")
-    except ImportError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="PDF export is not available on the server.",
-        ) from exc
-
-    canvas_cls = getattr(pdfgen_module, "Canvas")
-    letter = getattr(pagesizes_module, "letter")
-    simpleSplit = getattr(utils_module, "simpleSplit")
-
-    buffer = io.BytesIO()
-    pdf = canvas_cls(buffer, pagesize=letter)
-    width, height = letter
-    y = height - 50
-
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawString(40, y, "BragBoard Report Summary")
-    y -= 25
-    pdf.setFont("Helvetica", 10)
-    pdf.drawString(40, y, f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
-    y -= 20
-
-    if not reports:
-        pdf.drawString(40, y, "No reports found for the selected filter.")
-    else:
-        for report in reports:
-            lines = [
-                f"Report #{report.id} - {report.status.upper()}",
-                f"Reporter: {report.reporter.full_name} | Shout-Out #{report.shoutout.id} by {report.shoutout.created_by.full_name}",
-                f"Reported: {report.created_at.strftime('%Y-%m-%d %H:%M')}",
-            ]
-            if report.resolved_at:
-                lines.append(f"Resolved: {report.resolved_at.strftime('%Y-%m-%d %H:%M')}")
-            if report.reason:
-                lines.extend(simpleSplit(f"Reason: {report.reason}", "Helvetica", 10, width - 80))
-            lines.extend(simpleSplit(f"Content: {report.shoutout.content}", "Helvetica", 10, width - 80))
-            lines.append("")
-
-            for line in lines:
-                if y < 60:
-                    pdf.showPage()
-                    y = height - 50
-                    pdf.setFont("Helvetica", 10)
-                pdf.drawString(40, y, line)
-                y -= 14
-
-    pdf.save()
-    buffer.seek(0)
-    return StreamingResponse(
-        buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=reports-{timestamp}.pdf"
-        },
-    )
-
-
-@router.get("/leaderboard", response_model=List[schemas.LeaderboardEntry])
-def leaderboard(
-    db: Session = Depends(get_db),
-    _: User = Depends(require_admin),
-):
-    sent_counts = dict(
-        db.query(ShoutOut.created_by_id, func.count(ShoutOut.id))
-        .group_by(ShoutOut.created_by_id)
-        .all()
-    )
-    received_counts = dict(
-        db.query(ShoutOutRecipient.user_id, func.count(ShoutOutRecipient.shoutout_id))
-        .group_by(ShoutOutRecipient.user_id)
-        .all()
-    )
-    user_ids = set(sent_counts.keys()) | set(received_counts.keys())
-    if not user_ids:
-        return []
-
-    users = (
-        db.query(User)
-        .options(selectinload(User.department))
-        .filter(User.id.in_(user_ids))
-        .all()
-    )
-    user_by_id = {user.id: user for user in users}
-
-    entries: List[schemas.LeaderboardEntry] = []
-    for user_id in user_ids:
-        user = user_by_id.get(user_id)
-        if not user:
-            continue
-        sent = sent_counts.get(user_id, 0)
-        received = received_counts.get(user_id, 0)
-        points = sent * 2 + received
-        entries.append(
-            schemas.LeaderboardEntry(
-                user=user,
-                shoutouts_sent=sent,
-                shoutouts_received=received,
-                points=points,
-            )
-        )
-
-    entries.sort(key=lambda entry: entry.points, reverse=True)
-    return entries[:10]
-
+import csv
+import io
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, aliased, joinedload, raiseload, selectinload
+
+from .. import schemas
+from ..deps import get_db, require_admin
+from ..models import AdminNotification, Report, ShoutOut, ShoutOutRecipient, User
+
+# Resolve reportlab once at import instead of per export request
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen.canvas import Canvas
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+# orjson serializes the nested report/leaderboard payloads in C, several
+# times faster than the stdlib json path FastAPI defaults to.
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Dashboard metrics tolerate a little staleness, so the two aggregation
+# scans are amortized across requests with a short-lived cache.
+_METRICS_CACHE_TTL = 30.0
+_metrics_cache: Optional[tuple[float, schemas.AdminMetrics]] = None
+
+
+@router.get("/metrics", response_model=schemas.AdminMetrics)
+def get_admin_metrics(
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> schemas.AdminMetrics:
+    global _metrics_cache
+    now = time.monotonic()
+    if _metrics_cache is not None and now - _metrics_cache[0] < _METRICS_CACHE_TTL:
+        return _metrics_cache[1]
+    top_contributors = (
+        db.query(User, func.count(ShoutOut.id).label("count"))
+        .join(ShoutOut, ShoutOut.created_by_id == User.id)
+        .group_by(User.id)
+        .order_by(func.count(ShoutOut.id).desc())
+        .limit(5)
+        .all()
+    )
+    most_tagged = (
+        db.query(User, func.count(ShoutOutRecipient.shoutout_id).label("count"))
+        .join(ShoutOutRecipient, ShoutOutRecipient.user_id == User.id)
+        .group_by(User.id)
+        .order_by(func.count(ShoutOutRecipient.shoutout_id).desc())
+        .limit(5)
+        .all()
+    )
+    metrics = schemas.AdminMetrics(
+        top_contributors=[
+            schemas.UserStat(user=user, count=count) for user, count in top_contributors
+        ],
+        most_tagged=[
+            schemas.UserStat(user=user, count=count) for user, count in most_tagged
+        ],
+    )
+    _metrics_cache = (now, metrics)
+    return metrics
+
+
+def _validate_status_filter(status_filter: Optional[str]) -> None:
+    if status_filter and status_filter not in {"open", "resolved"}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status must be 'open' or 'resolved'",
+        )
+
+
+def _base_report_query(db: Session):
+    # All relationships are many-to-one single rows, so joined loads fold
+    # them into the main SELECT instead of extra IN queries. raiseload
+    # turns any relationship missed here into an error instead of a
+    # silent per-row lazy SELECT during serialization.
+    q = db.query(Report).options(
+        joinedload(Report.shoutout)
+        .joinedload(ShoutOut.created_by)
+        .joinedload(User.department),
+        joinedload(Report.reporter).joinedload(User.department),
+        joinedload(Report.resolved_by).joinedload(User.department),
+        raiseload("*"),
+    )
+    return q
+
+
+@router.get("/reports", response_model=List[schemas.ReportOut])
+def list_reports(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> List[schemas.ReportOut]:
+    _validate_status_filter(status_filter)
+    q = _base_report_query(db)
+    if status_filter:
+        q = q.filter(Report.status == status_filter)
+    reports = q.order_by(Report.created_at.desc()).all()
+    return reports
+
+
+@router.get("/notifications", response_model=List[schemas.AdminNotificationOut])
+def list_admin_notifications(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    event_type: Optional[str] = Query(None, alias="type"),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> List[schemas.AdminNotificationOut]:
+    query = (
+        db.query(AdminNotification)
+        .options(
+            joinedload(AdminNotification.actor).joinedload(User.department),
+            raiseload("*"),
+        )
+        .order_by(AdminNotification.created_at.desc())
+    )
+    if event_type:
+        query = query.filter(AdminNotification.event_type == event_type)
+    notifications = query.offset(offset).limit(limit).all()
+    return notifications
+
+
+@router.post("/reports/{report_id}/resolve", response_model=schemas.ReportOut)
+def resolve_report(
+    report_id: int,
+    db: Session = Depends(get_db),
+    admin_user: User = Depends(require_admin),
+) -> schemas.ReportOut:
+    # Same shape as _base_report_query: raiseload keeps the shoutout's
+    # mapper-level selectin collections (never serialized by ReportOut)
+    # from loading alongside the joined single-row relationships.
+    report = (
+        db.query(Report)
+        .options(
+            joinedload(Report.shoutout).joinedload(ShoutOut.created_by).joinedload(User.department),
+            joinedload(Report.reporter).joinedload(User.department),
+            joinedload(Report.resolved_by).joinedload(User.department),
+            raiseload("*"),
+        )
+        .filter(Report.id == report_id)
+        .first()
+    )
+    if not report:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+    if report.status == "resolved":
+        return report
+    report.status = "resolved"
+    report.resolved_at = datetime.now(timezone.utc)
+    report.resolved_by = admin_user
+    # Serialize before committing: the session commits with the default
+    # expire_on_commit=True, so touching the instance afterwards would
+    # re-SELECT the full row and its relationships. Everything the schema
+    # needs is already in hand, making the commit the last round-trip.
+    resolved = schemas.ReportOut.model_validate(report)
+    db.commit()
+    return resolved
+
+
+@router.get("/reports/export")
+async def export_reports(
+    format: str = Query("csv", pattern="^(csv|pdf)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    _validate_status_filter(status_filter)
+    q = _base_report_query(db)
+    if status_filter:
+        q = q.filter(Report.status == status_filter)
+    q = q.order_by(Report.created_at.desc())
+    generated_at = datetime.now(timezone.utc)
+    timestamp = generated_at.strftime("%Y%m%d%H%M%S")
+
+    if format == "csv":
+        # Select plain columns with timestamps formatted by Postgres, so
+        # rows arrive as ready-to-write strings with no ORM hydration and
+        # no per-row Python datetime formatting.
+        reporter_user = aliased(User)
+        author_user = aliased(User)
+        iso_format = 'YYYY-MM-DD"T"HH24:MI:SS'
+        csv_stmt = (
+            select(
+                Report.id,
+                Report.status,
+                reporter_user.full_name,
+                func.coalesce(Report.reason, ""),
+                ShoutOut.id,
+                author_user.full_name,
+                func.to_char(Report.created_at, iso_format),
+                func.coalesce(func.to_char(Report.resolved_at, iso_format), ""),
+            )
+            .join(reporter_user, Report.reporter_id == reporter_user.id)
+            .join(ShoutOut, Report.shoutout_id == ShoutOut.id)
+            .join(author_user, ShoutOut.created_by_id == author_user.id)
+            .order_by(Report.created_at.desc())
+        )
+        if status_filter:
+            csv_stmt = csv_stmt.where(Report.status == status_filter)
+
+        async def generate_csv():
+            # Stream rows in batches instead of materializing every report
+            # (and the full CSV) in memory before responding. Batches are
+            # fetched on the threadpool so the blocking DB iterator never
+            # runs on the event loop, while chunks are yielded natively.
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(
+                [
+                    "Report ID",
+                    "Status",
+                    "Reporter",
+                    "Reason",
+                    "Shout-Out ID",
+                    "Shout-Out Author",
+                    "Reported At",
+                    "Resolved At",
+                ]
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            # The initial execute (planning + first fetch) blocks too, so it
+            # goes through the threadpool like the batch fetches below.
+            result = await run_in_threadpool(
+                lambda: db.execute(csv_stmt.execution_options(yield_per=500))
+            )
+            rows = iter(result)
+            while True:
+                batch = await run_in_threadpool(lambda: list(islice(rows, 500)))
+                if not batch:
+                    break
+                writer.writerows(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
+        return StreamingResponse(
+            generate_csv(),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=reports-{timestamp}.csv"
+            },
+        )
+
+    # PDF export
+    if not REPORTLAB_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="PDF export is not available on the server.",
+        )
+
+    def build_pdf() -> io.BytesIO:
+        # Rows come in via yield_per so ORM memory stays bounded by the
+        # batch size; reportlab flushes each completed page on showPage.
+        buffer = io.BytesIO()
+        pdf = Canvas(buffer, pagesize=letter)
+        width, height = letter
+        y = height - 50
+
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(40, y, "BragBoard Report Summary")
+        y -= 25
+        pdf.setFont("Helvetica", 10)
+        pdf.drawString(40, y, f"Generated: {generated_at.strftime('%Y-%m-%d %H:%M UTC')}")
+        y -= 20
+
+        wrote_any = False
+        for report in q.yield_per(500):
+            wrote_any = True
+            lines = [
+                f"Report #{report.id} - {report.status.upper()}",
+                f"Reporter: {report.reporter.full_name} | Shout-Out #{report.shoutout.id} by {report.shoutout.created_by.full_name}",
+                f"Reported: {report.created_at.strftime('%Y-%m-%d %H:%M')}",
+            ]
+            if report.resolved_at:
+                lines.append(f"Resolved: {report.resolved_at.strftime('%Y-%m-%d %H:%M')}")
+            if report.reason:
+                lines.extend(simpleSplit(f"Reason: {report.reason}", "Helvetica", 10, width - 80))
+            lines.extend(simpleSplit(f"Content: {report.shoutout.content}", "Helvetica", 10, width - 80))
+            lines.append("")
+
+            for line in lines:
+                if y < 60:
+                    pdf.showPage()
+                    y = height - 50
+                    pdf.setFont("Helvetica", 10)
+                pdf.drawString(40, y, line)
+                y -= 14
+
+        if not wrote_any:
+            pdf.drawString(40, y, "No reports found for the selected filter.")
+
+        pdf.save()
+        buffer.seek(0)
+        return buffer
+
+    buffer = await run_in_threadpool(build_pdf)
+
+    async def stream_pdf():
+        while True:
+            chunk = buffer.read(65536)
+            if not chunk:
+                break
+            yield chunk
+
+    return StreamingResponse(
+        stream_pdf(),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=reports-{timestamp}.pdf"
+        },
+    )
+
+
+@router.get("/leaderboard", response_model=List[schemas.LeaderboardEntry])
+def leaderboard(
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    # Single round-trip: outer-join the sent/received aggregates onto users
+    # and let the database compute points, sort, and apply the limit.
+    sent_sq = (
+        db.query(
+            ShoutOut.created_by_id.label("user_id"),
+            func.count(ShoutOut.id).label("sent"),
+        )
+        .group_by(ShoutOut.created_by_id)
+        .subquery()
+    )
+    received_sq = (
+        db.query(
+            ShoutOutRecipient.user_id.label("user_id"),
+            func.count(ShoutOutRecipient.shoutout_id).label("received"),
+        )
+        .group_by(ShoutOutRecipient.user_id)
+        .subquery()
+    )
+    sent_col = func.coalesce(sent_sq.c.sent, 0)
+    received_col = func.coalesce(received_sq.c.received, 0)
+    rows = (
+        db.query(User, sent_col, received_col)
+        .options(selectinload(User.department), raiseload("*"))
+        .outerjoin(sent_sq, sent_sq.c.user_id == User.id)
+        .outerjoin(received_sq, received_sq.c.user_id == User.id)
+        .filter(or_(sent_sq.c.user_id.isnot(None), received_sq.c.user_id.isnot(None)))
+        .order_by((sent_col * 2 + received_col).desc())
+        .limit(10)
+        .all()
+    )
+    return [
+        schemas.LeaderboardEntry(
+            user=user,
+            shoutouts_sent=sent,
+            shoutouts_received=received,
+            points=sent * 2 + received,
+        )
+        for user, sent, received in rows
+    ]
+
@@ -1,13 +1,41 @@
+import base64
+import hashlib
+import hmac
+import json
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-import jwt
 from passlib.context import CryptContext
 
 from .config import settings
 
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# argon2id with explicit cost tuning; legacy pbkdf2 hashes keep verifying
+# and are flagged as deprecated so they can be rehashed on login.
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+
+# Tokens are always signed HS256, so the header segment and key bytes are
+# computed once at import instead of on every encode/decode.
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+_SECRET_KEY_BYTES = settings.secret_key.encode()
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
 
 
 def hash_password(password: str) -> str:
@@ -18,11 +46,21 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if the stored hash uses a deprecated scheme,
+    return a replacement hash the caller should persist.
+    """
+    return pwd_context.verify_and_update(password, password_hash)
+
+
 def _create_token(data: dict[str, Any], expires_delta: timedelta) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
+    to_encode.update({"exp": int(expire.timestamp())})
+    payload_b64 = _b64url_encode(json.dumps(to_encode, separators=(",", ":")).encode())
+    signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+    return (signing_input + b"." + _b64url_encode(_sign(signing_input))).decode()
 
 
 def create_access_token(subject: str) -> str:
@@ -33,10 +71,44 @@ def create_refresh_token(subject: str) -> str:
     return _create_token({"sub": subject, "type": "refresh"}, timedelta(days=settings.refresh_token_expires_days))
 
 
+# Verified payloads keyed by token string: every authenticated request
+# re-decodes the same bearer token, so memoizing the signature check and
+# JSON parse amortizes that work across a token's lifetime. Expiry is
+# still re-checked on every hit.
+_DECODED_TOKEN_CACHE: dict[str, dict[str, Any]] = {}
+_DECODED_TOKEN_CACHE_MAX = 4096
+
+
 def decode_token(token: str) -> Optional[dict[str, Any]]:
+    cached = _DECODED_TOKEN_CACHE.get(token)
+    if cached is not None:
+        exp = cached.get("exp")
+        if exp is None or exp >= datetime.now(timezone.utc).timestamp():
+            return cached
+        _DECODED_TOKEN_CACHE.pop(token, None)
+        return None
+    payload = _decode_token(token)
+    if payload is not None:
+        if len(_DECODED_TOKEN_CACHE) >= _DECODED_TOKEN_CACHE_MAX:
+            _DECODED_TOKEN_CACHE.clear()
+        _DECODED_TOKEN_CACHE[token] = payload
+    return payload
+
+
+def _decode_token(token: str) -> Optional[dict[str, Any]]:
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-    except jwt.PyJWTError:
+        signing_input, _, signature_b64 = token.encode().rpartition(b".")
+        header_b64, _, payload_b64 = signing_input.partition(b".")
+        if not header_b64 or not payload_b64 or not signature_b64:
+            return None
+        if not hmac.compare_digest(_b64url_encode(_sign(signing_input)), signature_b64):
+            return None
+        payload = json.loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError):
+        return None
+    exp = payload.get("exp")
+    if exp is not None and exp < datetime.now(timezone.utc).timestamp():
         return None
+    return payload
 
 
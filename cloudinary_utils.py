@@ -1,5 +1,7 @@
+import os
 from typing import Optional
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from .config import settings
 
@@ -13,24 +15,22 @@ except ImportError:
     cloudinary = None
     cloudinary_uploader = None
 
-# Initialize Cloudinary if credentials are provided and module is available
-_cloudinary_initialized = False
+# Configure Cloudinary exactly once at import; settings are loaded from the
+# environment before this module is imported, so there is nothing to re-check
+# per request.
+CLOUDINARY_READY = False
 if CLOUDINARY_AVAILABLE:
-    cloud_name = settings.cloudinary_cloud_name
-    api_key = settings.cloudinary_api_key
-    api_secret = settings.cloudinary_api_secret
-    
-    if cloud_name and api_key and api_secret:
-        try:
-            cloudinary.config(
-                cloud_name=cloud_name,
-                api_key=api_key,
-                api_secret=api_secret,
-            )
-            _cloudinary_initialized = True
-        except Exception as e:
-            _cloudinary_initialized = False
-            # Log error but don't fail - will be caught in upload function
+    if (
+        settings.cloudinary_cloud_name
+        and settings.cloudinary_api_key
+        and settings.cloudinary_api_secret
+    ):
+        cloudinary.config(
+            cloud_name=settings.cloudinary_cloud_name,
+            api_key=settings.cloudinary_api_key,
+            api_secret=settings.cloudinary_api_secret,
+        )
+        CLOUDINARY_READY = True
 
 ALLOWED_IMAGE_TYPES = {
     "image/jpeg": "jpg",
@@ -53,40 +53,19 @@ async def upload_image_to_cloudinary(file: UploadFile, folder: str = "shoutouts"
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Image upload service is not available. Cloudinary package is not installed."
         )
-    
-    # Re-check and initialize Cloudinary if needed (in case env vars were loaded after module import)
-    cloud_name = settings.cloudinary_cloud_name
-    api_key = settings.cloudinary_api_key
-    api_secret = settings.cloudinary_api_secret
-    
-    if not cloud_name or not api_key or not api_secret:
+
+    if not CLOUDINARY_READY:
         missing = []
-        if not cloud_name:
+        if not settings.cloudinary_cloud_name:
             missing.append("CLOUDINARY_CLOUD_NAME")
-        if not api_key:
+        if not settings.cloudinary_api_key:
             missing.append("CLOUDINARY_API_KEY")
-        if not api_secret:
+        if not settings.cloudinary_api_secret:
             missing.append("CLOUDINARY_API_SECRET")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Image upload service is not configured. Missing environment variables: {', '.join(missing)}. Please check your .env file in the backend directory."
         )
-    
-    # Initialize Cloudinary if not already initialized
-    global _cloudinary_initialized
-    if not _cloudinary_initialized:
-        try:
-            cloudinary.config(
-                cloud_name=cloud_name,
-                api_key=api_key,
-                api_secret=api_secret,
-            )
-            _cloudinary_initialized = True
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to initialize Cloudinary: {str(e)}"
-            )
 
     # Validate content type
     if file.content_type not in ALLOWED_IMAGE_TYPES:
@@ -95,28 +74,35 @@ async def upload_image_to_cloudinary(file: UploadFile, folder: str = "shoutouts"
             detail=f"Invalid image type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES.keys())}"
         )
 
-    # Read file content
-    contents = await file.read()
-    if not contents:
+    # Validate size by seeking the spooled temp file instead of reading the
+    # whole payload into a bytes object.
+    source = file.file
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(0)
+    if size == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Uploaded file is empty."
         )
-
-    # Validate file size
-    if len(contents) > MAX_IMAGE_SIZE:
+    if size > MAX_IMAGE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Image size exceeds maximum allowed size of {MAX_IMAGE_SIZE // (1024 * 1024)}MB."
         )
 
     try:
-        # Upload to Cloudinary
-        result = cloudinary.uploader.upload(
-            contents,
+        # Upload to Cloudinary straight from the file object; the SDK
+        # issues chunked uploads so the image never sits in memory whole.
+        # The SDK call blocks on network I/O, so run it on the threadpool
+        # instead of stalling the event loop for the full upload RTT.
+        result = await run_in_threadpool(
+            cloudinary.uploader.upload,
+            source,
             folder=folder,
             resource_type="image",
             allowed_formats=["jpg", "jpeg", "png", "gif", "webp"],
+            chunk_size=6_000_000,
         )
         return {
             "url": result.get("secure_url") or result.get("url"),
@@ -132,9 +118,7 @@ async def upload_image_to_cloudinary(file: UploadFile, folder: str = "shoutouts"
 
 def delete_image_from_cloudinary(public_id: str) -> None:
     """Delete an image from Cloudinary by public_id."""
-    if not CLOUDINARY_AVAILABLE:
-        return
-    if not settings.cloudinary_cloud_name:
+    if not CLOUDINARY_READY:
         return
     try:
         cloudinary.uploader.destroy(public_id)
@@ -32,6 +32,7 @@ class Settings:
     access_token_expires_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRES_MINUTES", "30"))
     refresh_token_expires_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRES_DAYS", "7"))
     admin_invite_code: Optional[str] = os.getenv("ADMIN_INVITE_CODE", "admin")
+    skip_auto_migrate: bool = os.getenv("SKIP_AUTO_MIGRATE", "0") == "1"
 
     _database_url_env: Optional[str] = os.getenv(
         "DATABASE_URL",
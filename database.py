@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import OperationalError
@@ -7,18 +8,45 @@ import time
 from .config import settings
 
 
-# Create engine with connection pooling and retry logic
+# Create engine with connection pooling and retry logic. Sync endpoints hold
+# a connection for the duration of each request on the anyio threadpool, so
+# the pool is sized to match that concurrency rather than queue behind it.
+# pool_pre_ping revalidates pooled connections on checkout (one cheap
+# SELECT 1) so connections silently dropped by NAT/firewalls are recycled
+# instead of surfacing as OperationalError storms; pool_recycle retires
+# connections before typical idle-timeout windows.
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+    pool_use_lifo=True,  # prefer recently-used (warm) connections
+    query_cache_size=1200,
     connect_args={
         "connect_timeout": 10,
+        "options": "-c statement_timeout=30000",
     }
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for async def endpoints; psycopg serves both modes from the
+# same URL, so the tuning mirrors the sync engine above.
+async_engine = create_async_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+    query_cache_size=1200,
+    connect_args={
+        "connect_timeout": 10,
+        "options": "-c statement_timeout=30000",
+    }
+)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, bind=async_engine)
+
 
 class Base(DeclarativeBase):
     pass
@@ -32,6 +60,124 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _run_auto_migration() -> None:
+    """
+    Lightweight column backfills for older databases. Guarded by a Postgres
+    advisory lock so only one worker inspects/alters the schema at boot.
+    """
+    try:
+        lock_conn = None
+        if engine.dialect.name == "postgresql":
+            lock_conn = engine.connect()
+            if not lock_conn.execute(text("SELECT pg_try_advisory_lock(4545)")).scalar():
+                # Another worker is already running the migration
+                lock_conn.close()
+                return
+        try:
+            inspector = inspect(engine)
+            # Ensure comments.parent_id exists
+            if 'comments' in inspector.get_table_names():
+                columns = {col['name'] for col in inspector.get_columns('comments')}
+                if 'parent_id' not in columns:
+                    with engine.begin() as conn:
+                        dialect = engine.dialect.name
+                        if dialect == 'mysql':
+                            conn.execute(text('ALTER TABLE comments ADD COLUMN parent_id INT NULL'))
+                        elif dialect == 'postgresql':
+                            conn.execute(text('ALTER TABLE comments ADD COLUMN parent_id INTEGER NULL'))
+                        else:  # sqlite and others
+                            conn.execute(text('ALTER TABLE comments ADD COLUMN parent_id INTEGER'))
+            # Ensure users.avatar_url and users.updated_at exist
+            if 'users' in inspector.get_table_names():
+                columns = {col['name'] for col in inspector.get_columns('users')}
+                if 'avatar_url' not in columns:
+                    with engine.begin() as conn:
+                        dialect = engine.dialect.name
+                        if dialect == 'mysql':
+                            conn.execute(text('ALTER TABLE users ADD COLUMN avatar_url VARCHAR(500) NULL'))
+                        elif dialect == 'postgresql':
+                            conn.execute(text('ALTER TABLE users ADD COLUMN avatar_url VARCHAR(500) NULL'))
+                        else:  # sqlite and others
+                            conn.execute(text('ALTER TABLE users ADD COLUMN avatar_url TEXT'))
+                if 'updated_at' not in columns:
+                    with engine.begin() as conn:
+                        dialect = engine.dialect.name
+                        if dialect == 'mysql':
+                            conn.execute(text('ALTER TABLE users ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP'))
+                        elif dialect == 'postgresql':
+                            conn.execute(text('ALTER TABLE users ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now()'))
+                        else:  # sqlite and others
+                            conn.execute(text('ALTER TABLE users ADD COLUMN updated_at TIMESTAMP'))
+            # Ensure created_at has a database-side default: the models now
+            # use server_default=func.now() instead of the old client-side
+            # datetime.utcnow, which only takes effect on tables created
+            # after the switch. Without this, pre-existing tables reject
+            # every INSERT that omits created_at (all the Core insert
+            # paths, which also rely on RETURNING the generated value).
+            if engine.dialect.name == 'postgresql':
+                table_names = set(inspector.get_table_names())
+                for table in ('departments', 'users', 'shoutouts', 'reactions', 'comments',
+                              'attachments', 'reports', 'notifications', 'admin_notifications'):
+                    if table not in table_names:
+                        continue
+                    created_at = next(
+                        (col for col in inspector.get_columns(table) if col['name'] == 'created_at'),
+                        None,
+                    )
+                    if created_at is not None and created_at.get('default') is None:
+                        with engine.begin() as conn:
+                            conn.execute(text(f'ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()'))
+            # Ensure composite indexes declared on the models exist: like the
+            # defaults above, create_all only materializes them for brand-new
+            # tables. IF NOT EXISTS keeps the backfill idempotent
+            # (Postgres-only, like the other backfills here).
+            if engine.dialect.name == 'postgresql':
+                with engine.begin() as conn:
+                    for ddl in (
+                        'CREATE INDEX IF NOT EXISTS ix_notif_user_read_created '
+                        'ON notifications (user_id, is_read, created_at)',
+                        'CREATE INDEX IF NOT EXISTS ix_shoutouts_dept_created_id '
+                        'ON shoutouts (department_id, created_at, id)',
+                        'CREATE INDEX IF NOT EXISTS ix_shoutouts_creator_created_id '
+                        'ON shoutouts (created_by_id, created_at, id)',
+                        'CREATE INDEX IF NOT EXISTS ix_comments_shoutout_created '
+                        'ON comments (shoutout_id, created_at)',
+                        'CREATE INDEX IF NOT EXISTS ix_shoutout_recipients_user_shoutout '
+                        'ON shoutout_recipients (user_id, shoutout_id)',
+                    ):
+                        conn.execute(text(ddl))
+            # Ensure the notifications dedupe constraint exists: create_all
+            # never alters existing tables, and the react/comment paths now
+            # rely on ON CONFLICT ON CONSTRAINT (Postgres-only, like the
+            # inserts that use it). Duplicates accumulated before the
+            # constraint must be cleared first or the ALTER fails; the
+            # oldest row per (user_id, shoutout_id) pair is kept.
+            if engine.dialect.name == 'postgresql' and 'notifications' in inspector.get_table_names():
+                constraints = {c['name'] for c in inspector.get_unique_constraints('notifications')}
+                if 'uq_notification_user_shoutout' not in constraints:
+                    with engine.begin() as conn:
+                        conn.execute(text(
+                            'DELETE FROM notifications a USING notifications b '
+                            'WHERE a.user_id = b.user_id AND a.shoutout_id = b.shoutout_id AND a.id > b.id'
+                        ))
+                        conn.execute(text(
+                            'ALTER TABLE notifications ADD CONSTRAINT uq_notification_user_shoutout '
+                            'UNIQUE (user_id, shoutout_id)'
+                        ))
+        finally:
+            if lock_conn is not None:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(4545)"))
+                lock_conn.close()
+    except Exception:
+        # Best-effort; ignore if the column already exists or cannot be altered at runtime
+        pass
+
+
 def init_db() -> None:
     """
     Initialize database tables. Retries connection with exponential backoff.
@@ -50,36 +196,10 @@ def init_db() -> None:
             # Create tables if they don't exist
             models.Base.metadata.create_all(bind=engine)
             
-            # Lightweight auto-migration: ensure comments.parent_id exists
-            try:
-                inspector = inspect(engine)
-                if 'comments' in inspector.get_table_names():
-                    columns = {col['name'] for col in inspector.get_columns('comments')}
-                    if 'parent_id' not in columns:
-                        with engine.begin() as conn:
-                            dialect = engine.dialect.name
-                            if dialect == 'mysql':
-                                conn.execute(text('ALTER TABLE comments ADD COLUMN parent_id INT NULL'))
-                            elif dialect == 'postgresql':
-                                conn.execute(text('ALTER TABLE comments ADD COLUMN parent_id INTEGER NULL'))
-                            else:  # sqlite and others
-                                conn.execute(text('ALTER TABLE comments ADD COLUMN parent_id INTEGER'))
-                # Ensure users.avatar_url exists
-                if 'users' in inspector.get_table_names():
-                    columns = {col['name'] for col in inspector.get_columns('users')}
-                    if 'avatar_url' not in columns:
-                        with engine.begin() as conn:
-                            dialect = engine.dialect.name
-                            if dialect == 'mysql':
-                                conn.execute(text('ALTER TABLE users ADD COLUMN avatar_url VARCHAR(500) NULL'))
-                            elif dialect == 'postgresql':
-                                conn.execute(text('ALTER TABLE users ADD COLUMN avatar_url VARCHAR(500) NULL'))
-                            else:  # sqlite and others
-                                conn.execute(text('ALTER TABLE users ADD COLUMN avatar_url TEXT'))
-            except Exception:
-                # Best-effort; ignore if the column already exists or cannot be altered at runtime
-                pass
-            
+            # Lightweight auto-migration, unless disabled for fast boots
+            if not settings.skip_auto_migrate:
+                _run_auto_migration()
+
             return  # Success, exit retry loop
             
         except (OperationalError, Exception) as e:
@@ -1,39 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from .. import schemas
-from ..database import get_db
-from ..deps import get_current_user, require_admin
-from ..models import Department, User
-
-
-router = APIRouter()
-
-
-@router.get("/public", response_model=list[schemas.DepartmentOut])
-def list_departments_public(db: Session = Depends(get_db)):
-    return db.query(Department).all()
-
-
-@router.get("/", response_model=list[schemas.DepartmentOut])
-def list_departments_scoped(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if current_user.is_admin:
-        return db.query(Department).all()
-    if current_user.department_id is None:
-        return []
-    dep = db.get(Department, current_user.department_id)
-    return [dep] if dep else []
-
-
-@router.post("/", response_model=schemas.DepartmentOut)
-def create_department(data: schemas.DepartmentCreate, _: None = Depends(require_admin), db: Session = Depends(get_db)):
-    exists = db.query(Department).filter(Department.name == data.name).first()
-    if exists:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Department already exists")
-    dep = Department(name=data.name)
-    db.add(dep)
-    db.commit()
-    db.refresh(dep)
-    return dep
-
-
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import schemas
+from ..database import get_async_db
+from ..deps import get_current_user, require_admin
+from ..models import Department, User
+
+
+router = APIRouter()
+
+# Departments are a tiny read-mostly reference table (seeded once at
+# startup), so the public listing is cached in-process and invalidated by
+# bumping the version whenever a department is created.
+_dept_cache: Optional[tuple[int, list[schemas.DepartmentOut]]] = None
+_dept_version = 0
+
+
+def bump_department_cache_version() -> None:
+    global _dept_version
+    _dept_version += 1
+
+
+@router.get("/public", response_model=list[schemas.DepartmentOut])
+async def list_departments_public(db: AsyncSession = Depends(get_async_db)):
+    global _dept_cache
+    if _dept_cache is not None and _dept_cache[0] == _dept_version:
+        return _dept_cache[1]
+    rows = (await db.execute(select(Department))).scalars().all()
+    departments = [
+        schemas.DepartmentOut.model_construct(
+            id=dep.id, name=dep.name, created_at=dep.created_at
+        )
+        for dep in rows
+    ]
+    _dept_cache = (_dept_version, departments)
+    return departments
+
+
+@router.get("/", response_model=list[schemas.DepartmentOut])
+async def list_departments_scoped(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    if current_user.is_admin:
+        return (await db.execute(select(Department))).scalars().all()
+    if current_user.department_id is None:
+        return []
+    dep = await db.get(Department, current_user.department_id)
+    return [dep] if dep else []
+
+
+@router.post("/", response_model=schemas.DepartmentOut)
+async def create_department(data: schemas.DepartmentCreate, _: None = Depends(require_admin), db: AsyncSession = Depends(get_async_db)):
+    # The unique index on Department.name already enforces this; insert
+    # optimistically instead of paying a pre-check SELECT per create.
+    dep = Department(name=data.name)
+    db.add(dep)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Department already exists")
+    await db.refresh(dep)
+    bump_department_cache_version()
+    return dep
+
+
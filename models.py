@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Boolean, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
@@ -12,7 +12,7 @@ class Department(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     users: Mapped[list["User"]] = relationship("User", back_populates="department")
 
@@ -27,41 +27,60 @@ class User(Base):
     avatar_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     department_id: Mapped[int | None] = mapped_column(ForeignKey("departments.id"), nullable=True, index=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Bumped on every UPDATE; MAX(updated_at) is the ETag for user listings
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
     department: Mapped[Department | None] = relationship("Department", back_populates="users")
 
 
 class ShoutOut(Base):
     __tablename__ = "shoutouts"
+    # Match the feed's keyset ordering (created_at, id desc) under its two
+    # most common filters, so those pages come straight off an index scan
+    # instead of filter-then-sort.
+    __table_args__ = (
+        Index("ix_shoutouts_dept_created_id", "department_id", "created_at", "id"),
+        Index("ix_shoutouts_creator_created_id", "created_by_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     content: Mapped[str] = mapped_column(String(1000), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     created_by_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     department_id: Mapped[int | None] = mapped_column(ForeignKey("departments.id"), nullable=True, index=True)
 
-    created_by: Mapped["User"] = relationship("User", backref="shoutouts_sent")
+    # Serialization always walks these relationships, so eager loading is
+    # the default at the mapper level: collections batch-load with one
+    # IN query each, and the single-row author folds into the main SELECT.
+    # Queries that don't need them can still opt out per-query.
+    created_by: Mapped["User"] = relationship("User", backref="shoutouts_sent", lazy="joined")
     department: Mapped[Department | None] = relationship("Department")
     recipients: Mapped[list["ShoutOutRecipient"]] = relationship(
         "ShoutOutRecipient",
         back_populates="shoutout",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
     reactions: Mapped[list["Reaction"]] = relationship(
         "Reaction",
         back_populates="shoutout",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
     comments: Mapped[list["Comment"]] = relationship(
         "Comment",
         back_populates="shoutout",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
     attachments: Mapped[list["Attachment"]] = relationship(
         "Attachment",
         back_populates="shoutout",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
     reports: Mapped[list["Report"]] = relationship(
         "Report",
@@ -72,6 +91,10 @@ class ShoutOut(Base):
 
 class ShoutOutRecipient(Base):
     __tablename__ = "shoutout_recipients"
+    # Reverse of the composite PK, for "shoutouts received by user" probes
+    __table_args__ = (
+        Index("ix_shoutout_recipients_user_shoutout", "user_id", "shoutout_id"),
+    )
     shoutout_id: Mapped[int] = mapped_column(ForeignKey("shoutouts.id"), primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
     user: Mapped["User"] = relationship("User")
@@ -87,7 +110,7 @@ class Reaction(Base):
     shoutout_id: Mapped[int] = mapped_column(ForeignKey("shoutouts.id"), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     type: Mapped[str] = mapped_column(String(16), nullable=False)  # like, clap, star
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     shoutout: Mapped["ShoutOut"] = relationship("ShoutOut", back_populates="reactions")
     user: Mapped["User"] = relationship("User")
@@ -95,11 +118,15 @@ class Reaction(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    # Matches the per-shoutout comment listing (filter + created_at order)
+    __table_args__ = (
+        Index("ix_comments_shoutout_created", "shoutout_id", "created_at"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     shoutout_id: Mapped[int] = mapped_column(ForeignKey("shoutouts.id"), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     content: Mapped[str] = mapped_column(String(500), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     parent_id: Mapped[int | None] = mapped_column(ForeignKey("comments.id"), nullable=True, index=True)
 
     shoutout: Mapped["ShoutOut"] = relationship("ShoutOut", back_populates="comments")
@@ -123,7 +150,7 @@ class Attachment(Base):
     file_url: Mapped[str] = mapped_column(String(500), nullable=False)
     file_name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_type: Mapped[str] = mapped_column(String(50), nullable=False)  # image/jpeg, image/png, etc.
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     shoutout: Mapped["ShoutOut"] = relationship("ShoutOut", back_populates="attachments")
 
@@ -136,8 +163,8 @@ class Report(Base):
     reporter_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     reason: Mapped[str | None] = mapped_column(String(500), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="open", nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    resolved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    resolved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     resolved_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
 
     shoutout: Mapped["ShoutOut"] = relationship("ShoutOut", back_populates="reports")
@@ -147,14 +174,22 @@ class Report(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    # Covers the listing query (user_id, optionally is_read, ordered by
+    # created_at) and, via its prefix, the unread-count query. The unique
+    # constraint backs the ON CONFLICT DO NOTHING dedupe on react/comment
+    # fan-out: one notification per user per shoutout.
+    __table_args__ = (
+        Index("ix_notif_user_read_created", "user_id", "is_read", "created_at"),
+        UniqueConstraint("user_id", "shoutout_id", name="uq_notification_user_shoutout"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     shoutout_id: Mapped[int] = mapped_column(ForeignKey("shoutouts.id"), nullable=False, index=True)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    user: Mapped["User"] = relationship("User", backref="notifications")
+    user: Mapped["User"] = relationship("User", backref="notifications", lazy="joined")
     shoutout: Mapped["ShoutOut"] = relationship("ShoutOut")
 
 
@@ -164,7 +199,7 @@ class AdminNotification(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     message: Mapped[str] = mapped_column(String(500), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     actor_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     shoutout_id: Mapped[int | None] = mapped_column(ForeignKey("shoutouts.id"), nullable=True)
     report_id: Mapped[int | None] = mapped_column(ForeignKey("reports.id"), nullable=True)
@@ -1,101 +1,214 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, selectinload
-from typing import List
-
-from .. import schemas
-from ..models import Notification, ShoutOut, User, ShoutOutRecipient, Reaction, Comment, Attachment
-from ..deps import get_current_user, get_db
-
-router = APIRouter()
-
-
-def _serialize_shoutout(shout: ShoutOut, db: Session):
-    recipients_users = [db.get(User, r.user_id) for r in shout.recipients]
-    return schemas.ShoutOutOut(
-        id=shout.id,
-        content=shout.content,
-        department_id=shout.department_id,
-        created_at=shout.created_at,
-        created_by=shout.created_by,
-        recipients=recipients_users,
-        reactions=shout.reactions,
-        comments=shout.comments,
-        attachments=shout.attachments if hasattr(shout, 'attachments') else [],
-    )
-
-
-@router.get("/", response_model=List[schemas.NotificationOut])
-def get_notifications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    unread_only: bool = False,
-):
-    """Get all notifications for the current user"""
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
-    if unread_only:
-        query = query.filter(Notification.is_read == False)
-    
-    notifications = query.options(
-        selectinload(Notification.shoutout).selectinload(ShoutOut.created_by),
-        selectinload(Notification.shoutout).selectinload(ShoutOut.recipients),
-        selectinload(Notification.shoutout).selectinload(ShoutOut.reactions).selectinload(Reaction.user),
-        selectinload(Notification.shoutout).selectinload(ShoutOut.comments).selectinload(Comment.user),
-        selectinload(Notification.shoutout).selectinload(ShoutOut.attachments),
-    ).order_by(Notification.created_at.desc()).all()
-    
-    # Serialize notifications properly
-    result = []
-    for notif in notifications:
-        shoutout_data = _serialize_shoutout(notif.shoutout, db)
-        result.append(schemas.NotificationOut(
-            id=notif.id,
-            user_id=notif.user_id,
-            shoutout=shoutout_data,
-            is_read=notif.is_read,
-            created_at=notif.created_at,
-        ))
-    
-    return result
-
-
-@router.get("/count", response_model=schemas.NotificationCount)
-def get_notification_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Get count of unread notifications for the current user"""
-    count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    ).count()
-    return schemas.NotificationCount(unread_count=count)
-
-
-@router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
-def mark_notification_read(
-    notification_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Mark a notification as read"""
-    notification = db.get(Notification, notification_id)
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    if notification.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to modify this notification")
-    notification.is_read = True
-    db.commit()
-
-
-@router.post("/read-all", status_code=status.HTTP_204_NO_CONTENT)
-def mark_all_notifications_read(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Mark all notifications as read for the current user"""
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    ).update({"is_read": True})
-    db.commit()
-
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from typing import List
+
+from .. import schemas
+from ..database import get_async_db
+from ..models import Notification, ShoutOut, User, ShoutOutRecipient, Reaction, Comment, Attachment
+from ..deps import get_current_user
+from ..schemas_out import NotificationOutTD, ShoutOutOutTD, UserOutTD
+
+router = APIRouter()
+
+# Built once at import: FastAPI would otherwise re-validate the already
+# constructed objects against the response_model on every request before
+# encoding them, and TypeAdapter construction itself rebuilds the core
+# schema for the whole nested model tree.
+_COUNT_ADAPTER = TypeAdapter(schemas.NotificationCount)
+
+
+# Everything serialized below comes straight from the ORM and is already
+# typed and constrained by the database, so responses are assembled as
+# plain dicts matching the TypedDict shapes in schemas_out and handed to
+# orjson directly — no per-object validators, no BaseModel allocation.
+# Untrusted request payloads still go through normal validation.
+
+def _user_out(user: User, cache: dict[int, UserOutTD]) -> UserOutTD:
+    # The same user typically appears many times across one notification
+    # page (author of several shoutouts, repeat reactor/commenter); build
+    # their dict once per request and reuse it. orjson serializes the
+    # shared dict at each position, so the response is unchanged.
+    cached = cache.get(user.id)
+    if cached is not None:
+        return cached
+    department = user.department
+    out: UserOutTD = {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "is_admin": user.is_admin,
+        "avatar_url": user.avatar_url,
+        "department": {
+            "id": department.id,
+            "name": department.name,
+            "created_at": department.created_at,
+        } if department else None,
+        "created_at": user.created_at,
+    }
+    cache[user.id] = out
+    return out
+
+
+def _serialize_shoutout(shout: ShoutOut, user_cache: dict[int, UserOutTD]) -> ShoutOutOutTD:
+    return {
+        "id": shout.id,
+        "content": shout.content,
+        "department_id": shout.department_id,
+        "created_at": shout.created_at,
+        "created_by": _user_out(shout.created_by, user_cache),
+        "recipients": [_user_out(r.user, user_cache) for r in shout.recipients],
+        "reactions": [
+            {
+                "id": reaction.id,
+                "type": reaction.type,
+                "user": _user_out(reaction.user, user_cache),
+                "created_at": reaction.created_at,
+            }
+            for reaction in shout.reactions
+        ],
+        "comments": [
+            {
+                "id": comment.id,
+                "content": comment.content,
+                "user": _user_out(comment.user, user_cache),
+                "created_at": comment.created_at,
+                "parent_id": comment.parent_id,
+            }
+            for comment in shout.comments
+        ],
+        "attachments": [
+            {
+                "id": attachment.id,
+                "file_url": attachment.file_url,
+                "file_name": attachment.file_name,
+                "file_type": attachment.file_type,
+                "created_at": attachment.created_at,
+            }
+            for attachment in shout.attachments
+        ],
+    }
+
+
+@router.get("/", response_model=None)
+async def get_notifications(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+    unread_only: bool = False,
+):
+    """Get all notifications for the current user"""
+    stmt = select(Notification).filter(Notification.user_id == current_user.id)
+    if unread_only:
+        stmt = stmt.filter(Notification.is_read == False)
+
+    # Every relationship the serializer touches must be eager-loaded here:
+    # AsyncSession has no implicit lazy loading to fall back on. Many-to-one
+    # hops (shoutout, each collection's user, department) fold into their
+    # parent SELECT via joinedload; selectin stays only for the collections,
+    # where a join would multiply rows.
+    stmt = stmt.options(
+        joinedload(Notification.shoutout)
+        .joinedload(ShoutOut.created_by)
+        .joinedload(User.department),
+        joinedload(Notification.shoutout)
+        .selectinload(ShoutOut.recipients)
+        .joinedload(ShoutOutRecipient.user)
+        .joinedload(User.department),
+        joinedload(Notification.shoutout)
+        .selectinload(ShoutOut.reactions)
+        .joinedload(Reaction.user)
+        .joinedload(User.department),
+        joinedload(Notification.shoutout)
+        .selectinload(ShoutOut.comments)
+        .joinedload(Comment.user)
+        .joinedload(User.department),
+        joinedload(Notification.shoutout).selectinload(ShoutOut.attachments),
+    ).order_by(Notification.created_at.desc())
+    notifications = (await db.execute(stmt)).scalars().all()
+
+    user_cache: dict[int, UserOutTD] = {}
+    result: List[NotificationOutTD] = [
+        {
+            "id": notif.id,
+            "user_id": notif.user_id,
+            "shoutout": _serialize_shoutout(notif.shoutout, user_cache),
+            "is_read": notif.is_read,
+            "created_at": notif.created_at,
+        }
+        for notif in notifications
+    ]
+    # orjson encodes datetimes natively, so the dicts go straight out.
+    return ORJSONResponse(result)
+
+
+@router.get("/count", response_model=None)
+async def get_notification_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get count of unread notifications for the current user"""
+    count = (
+        await db.execute(
+            select(func.count())
+            .select_from(Notification)
+            .filter(
+                Notification.user_id == current_user.id,
+                Notification.is_read == False,
+            )
+        )
+    ).scalar_one()
+    return ORJSONResponse(
+        _COUNT_ADAPTER.dump_python(
+            schemas.NotificationCount.model_construct(unread_count=count), mode="json"
+        )
+    )
+
+
+@router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_notification_read(
+    notification_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Mark a notification as read"""
+    # One conditional UPDATE covers the happy path; only when nothing
+    # matched do we pay a SELECT to tell 404 from 403.
+    result = await db.execute(
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id,
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        notification = await db.get(Notification, notification_id)
+        if not notification:
+            raise HTTPException(status_code=404, detail="Notification not found")
+        raise HTTPException(status_code=403, detail="Not allowed to modify this notification")
+
+
+@router.post("/read-all", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_all_notifications_read(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Mark all notifications as read for the current user"""
+    # Fire-and-forget bulk UPDATE; nothing in this session needs its
+    # in-memory state reconciled, so skip the synchronization pass.
+    await db.execute(
+        update(Notification)
+        .where(
+            Notification.user_id == current_user.id,
+            Notification.is_read == False,
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
@@ -1,11 +1,26 @@
-import re
 from datetime import datetime
 from typing import Optional, List
 
 from pydantic import BaseModel, Field, EmailStr, field_validator
 
-# Password must have: uppercase, lowercase, number, special char, min 8 chars
-PASSWORD_REGEX = re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*[0-9])(?=.*[!@#$%^&*()_+\-={}\[\]|;:'\",.<>/?]).{8,}$")
+# Password must have: uppercase, lowercase, number, special char, min 8 chars.
+# Checked with one linear scan instead of a regex whose four lookaheads each
+# re-scan the whole string.
+_PASSWORD_SPECIALS = frozenset("!@#$%^&*()_+-={}[]|;:'\",.<>/?")
+
+
+def _password_is_valid(value: str) -> bool:
+    has_lower = has_upper = has_digit = has_special = False
+    for c in value:
+        if c.islower():
+            has_lower = True
+        elif c.isupper():
+            has_upper = True
+        elif c.isdigit():
+            has_digit = True
+        elif c in _PASSWORD_SPECIALS:
+            has_special = True
+    return len(value) >= 8 and has_lower and has_upper and has_digit and has_special
 
 
 class DepartmentBase(BaseModel):
@@ -37,7 +52,7 @@ class UserCreate(UserBase):
     @field_validator("password")
     @classmethod
     def validate_password(cls, value: str) -> str:
-        if not PASSWORD_REGEX.match(value):
+        if not _password_is_valid(value):
             raise ValueError(
                 "Password must be at least 8 characters long and include an uppercase letter, lowercase letter, number, and special character."
             )
@@ -62,7 +77,7 @@ class PasswordChangeRequest(BaseModel):
     @field_validator("new_password")
     @classmethod
     def validate_new_password(cls, value: str) -> str:
-        if not PASSWORD_REGEX.match(value):
+        if not _password_is_valid(value):
             raise ValueError(
                 "Password must be at least 8 characters long and include an uppercase letter, lowercase letter, number, and special character."
             )
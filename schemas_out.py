@@ -0,0 +1,69 @@
+"""
+TypedDict mirrors of the read-only response shapes in schemas.py.
+
+Pure-output endpoints that serialize trusted ORM rows build these as plain
+dicts and hand them straight to orjson: no per-field validators run and no
+BaseModel instances are allocated, while the shapes stay documented here in
+one place. Request payloads keep using the Pydantic models in schemas.py.
+"""
+from datetime import datetime
+from typing import List, Optional, TypedDict
+
+
+class DepartmentOutTD(TypedDict):
+    id: int
+    name: str
+    created_at: datetime
+
+
+class UserOutTD(TypedDict):
+    id: int
+    email: str
+    full_name: str
+    is_admin: bool
+    avatar_url: Optional[str]
+    department: Optional[DepartmentOutTD]
+    created_at: datetime
+
+
+class ReactionOutTD(TypedDict):
+    id: int
+    type: str
+    user: UserOutTD
+    created_at: datetime
+
+
+class CommentOutTD(TypedDict):
+    id: int
+    content: str
+    user: UserOutTD
+    created_at: datetime
+    parent_id: Optional[int]
+
+
+class AttachmentOutTD(TypedDict):
+    id: int
+    file_url: str
+    file_name: str
+    file_type: str
+    created_at: datetime
+
+
+class ShoutOutOutTD(TypedDict):
+    id: int
+    content: str
+    department_id: Optional[int]
+    created_at: datetime
+    created_by: UserOutTD
+    recipients: List[UserOutTD]
+    reactions: List[ReactionOutTD]
+    comments: List[CommentOutTD]
+    attachments: List[AttachmentOutTD]
+
+
+class NotificationOutTD(TypedDict):
+    id: int
+    user_id: int
+    shoutout: ShoutOutOutTD
+    is_read: bool
+    created_at: datetime
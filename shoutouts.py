@@ -1,486 +1,652 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import exists, or_
-from typing import List, Optional
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
-
-from .. import schemas
-from ..models import (
-    AdminNotification,
-    User,
-    ShoutOut,
-    ShoutOutRecipient,
-    Reaction,
-    Comment,
-    Attachment,
-    Report,
-    Notification,
-)
-from ..deps import get_current_user, get_db
-from ..cloudinary_utils import upload_image_to_cloudinary
-
-
-def _truncate(text: str, limit: int = 80) -> str:
-    clean = (text or "").strip()
-    if len(clean) <= limit:
-        return clean
-    return clean[: limit - 3].rstrip() + "..."
-
-
-def _notify_admins(
-    db: Session,
-    *,
-    actor: User,
-    event_type: str,
-    message: str,
-    shoutout_id: int | None = None,
-    report_id: int | None = None,
-) -> None:
-    note = AdminNotification(
-        event_type=event_type,
-        message=_truncate(message, 500),
-        actor_id=actor.id,
-        shoutout_id=shoutout_id,
-        report_id=report_id,
-    )
-    db.add(note)
-
-
-IST = ZoneInfo("Asia/Kolkata")
-
-
-def _to_ist(dt: datetime | None) -> datetime | None:
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(IST)
-
-
-def _apply_ist_to_reactions(reactions: List[Reaction]) -> List[Reaction]:
-    for reaction in reactions:
-        reaction.created_at = _to_ist(reaction.created_at)
-    return reactions
-
-
-def _apply_ist_to_comments(comments: List[Comment]) -> List[Comment]:
-    for comment in comments:
-        comment.created_at = _to_ist(comment.created_at)
-    return comments
-
-
-def _apply_ist_to_attachments(attachments: List[Attachment]) -> List[Attachment]:
-    for attachment in attachments:
-        attachment.created_at = _to_ist(attachment.created_at)
-    return attachments
-
-
-router = APIRouter()
-
-def _serialize_shoutout(shout: ShoutOut, db: Session):
-    recipients_users = [db.get(User, r.user_id) for r in shout.recipients]
-    shout.created_at = _to_ist(shout.created_at)
-    reactions = _apply_ist_to_reactions(shout.reactions)
-    comments = _apply_ist_to_comments(shout.comments)
-    attachments = _apply_ist_to_attachments(shout.attachments if hasattr(shout, "attachments") else [])
-    return schemas.ShoutOutOut(
-        id=shout.id,
-        content=shout.content,
-        department_id=shout.department_id,
-        created_at=shout.created_at,
-        created_by=shout.created_by,
-        recipients=recipients_users,
-        reactions=reactions,
-        comments=comments,
-        attachments=attachments,
-    )
-
-@router.post("/", response_model=schemas.ShoutOutOut)
-def create_shoutout(
-    data: schemas.ShoutOutCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    # Validation is handled by Pydantic schema, but keeping for backward compatibility
-    if not data.recipient_ids or len(data.recipient_ids) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one recipient is required."
-        )
-    shout = ShoutOut(
-        content=data.content,
-        department_id=data.department_id or current_user.department_id,
-        created_by_id=current_user.id,
-    )
-    db.add(shout)
-    db.flush()
-    recipients = []
-    notifications = []
-    for rid in set(data.recipient_ids):
-        recipients.append(ShoutOutRecipient(shoutout_id=shout.id, user_id=rid))
-        # Create notification for each recipient (excluding the creator)
-        if rid != current_user.id:
-            notifications.append(Notification(shoutout_id=shout.id, user_id=rid))
-    db.add_all(recipients)
-    if notifications:
-        db.add_all(notifications)
-    db.commit()
-    db.refresh(shout)
-    # Eager load relationships for serialization
-    shout = db.query(ShoutOut).options(
-        selectinload(ShoutOut.created_by),
-        selectinload(ShoutOut.recipients),
-        selectinload(ShoutOut.reactions).selectinload(Reaction.user),
-        selectinload(ShoutOut.comments).selectinload(Comment.user),
-        selectinload(ShoutOut.attachments)
-    ).filter(ShoutOut.id == shout.id).first()
-    # Correct serialization: return User objects for recipients
-    return _serialize_shoutout(shout, db)
-
-@router.get("/", response_model=List[schemas.ShoutOutOut])
-def list_shoutouts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    department: Optional[int] = Query(None),
-    sender: Optional[int] = Query(None),
-    recipient: Optional[int] = Query(None),
-    start_date: Optional[datetime] = Query(None),
-    end_date: Optional[datetime] = Query(None),
-    has_attachments: Optional[bool] = Query(None),
-    limit: int = Query(50, le=100),
-    offset: int = Query(0),
-):
-    q = db.query(ShoutOut).options(
-        selectinload(ShoutOut.created_by),
-        selectinload(ShoutOut.recipients),
-        selectinload(ShoutOut.reactions).selectinload(Reaction.user),
-        selectinload(ShoutOut.comments).selectinload(Comment.user),
-        selectinload(ShoutOut.attachments)
-    )
-    if department:
-        q = q.filter(ShoutOut.department_id == department)
-    if sender:
-        q = q.filter(ShoutOut.created_by_id == sender)
-    if recipient:
-        q = q.join(ShoutOutRecipient).filter(ShoutOutRecipient.user_id == recipient)
-    if start_date:
-        q = q.filter(ShoutOut.created_at >= start_date)
-    if end_date:
-        q = q.filter(ShoutOut.created_at <= end_date)
-    if has_attachments is not None:
-        attachment_exists = exists().where(Attachment.shoutout_id == ShoutOut.id)
-        if has_attachments:
-            q = q.filter(attachment_exists)
-        else:
-            q = q.filter(~attachment_exists)
-    # Allow all users to see shoutouts from all departments
-    # Department filtering is now handled by the department query parameter above
-    # Removed department restriction so users can see and interact with posts from all departments
-    shoutouts = q.order_by(ShoutOut.created_at.desc()).offset(offset).limit(limit).all()
-    # Correct serialization for recipients
-    return [_serialize_shoutout(so, db) for so in shoutouts]
-
-@router.post("/{shoutout_id}/react", response_model=schemas.ReactionOut)
-def react_to_shoutout(
-    shoutout_id: int,
-    data: schemas.ReactionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    shout = db.get(ShoutOut, shoutout_id)
-    if not shout:
-        raise HTTPException(status_code=404, detail="ShoutOut not found")
-    existing = (
-        db.query(Reaction)
-        .filter_by(shoutout_id=shoutout_id, user_id=current_user.id)
-        .first()
-    )
-    if existing:
-        if existing.type == data.type:
-            db.delete(existing)
-            db.commit()
-            raise HTTPException(
-                status_code=200, detail="Reaction removed."
-            )
-        existing.type = data.type
-        db.commit()
-        db.refresh(existing)
-        reaction = (
-            db.query(Reaction)
-            .options(selectinload(Reaction.user))
-            .filter(Reaction.id == existing.id)
-            .first()
-        )
-        reaction.created_at = _to_ist(reaction.created_at)
-        return reaction
-    reaction = Reaction(
-        shoutout_id=shoutout_id,
-        user_id=current_user.id,
-        type=data.type,
-    )
-    db.add(reaction)
-    db.commit()
-    db.refresh(reaction)
-    
-    # Create notification for the shoutout creator if they're not the one reacting
-    if shout.created_by_id != current_user.id:
-        # Check if notification already exists for this reaction
-        existing_notif = db.query(Notification).filter_by(
-            user_id=shout.created_by_id,
-            shoutout_id=shoutout_id
-        ).first()
-        if not existing_notif:
-            notification = Notification(
-                user_id=shout.created_by_id,
-                shoutout_id=shoutout_id,
-            )
-            db.add(notification)
-            db.commit()
-    
-    # Reload reaction with user relationship for proper serialization
-    reaction = db.query(Reaction).options(selectinload(Reaction.user)).filter(Reaction.id == reaction.id).first()
-    reaction.created_at = _to_ist(reaction.created_at)
-    return reaction
-
-@router.get("/{shoutout_id}/comments", response_model=List[schemas.CommentOut])
-def get_shoutout_comments(
-    shoutout_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Get all comments for a specific shoutout"""
-    shout = db.get(ShoutOut, shoutout_id)
-    if not shout:
-        raise HTTPException(status_code=404, detail="ShoutOut not found")
-    
-    comments = db.query(Comment).options(
-        selectinload(Comment.user)
-    ).filter(Comment.shoutout_id == shoutout_id).order_by(Comment.created_at.asc()).all()
-    
-    return _apply_ist_to_comments(comments)
-
-
-@router.post("/{shoutout_id}/comment", response_model=schemas.CommentOut)
-def comment_on_shoutout(
-    shoutout_id: int,
-    data: schemas.CommentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Add a comment to a shoutout"""
-    shout = db.get(ShoutOut, shoutout_id)
-    if not shout:
-        raise HTTPException(status_code=404, detail="ShoutOut not found")
-    
-    # Validation is handled by Pydantic schema
-    if not data.content or not data.content.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Comment content cannot be empty."
-        )
-    # Validate parent comment if provided
-    parent_id = data.parent_id
-    if parent_id is not None:
-        parent = db.get(Comment, parent_id)
-        if not parent:
-            raise HTTPException(status_code=404, detail="Parent comment not found")
-        if parent.shoutout_id != shoutout_id:
-            raise HTTPException(status_code=400, detail="Parent comment mismatch for shoutout")
-    
-    comment = Comment(
-        shoutout_id=shoutout_id,
-        user_id=current_user.id,
-        content=data.content.strip(),
-        parent_id=parent_id,
-    )
-    db.add(comment)
-    db.commit()
-    
-    # Create notification for the shoutout creator if they're not the one commenting
-    if shout.created_by_id != current_user.id:
-        # Check if notification already exists for this shoutout
-        existing_notif = db.query(Notification).filter_by(
-            user_id=shout.created_by_id,
-            shoutout_id=shoutout_id
-        ).first()
-        if not existing_notif:
-            notification = Notification(
-                user_id=shout.created_by_id,
-                shoutout_id=shoutout_id,
-            )
-            db.add(notification)
-            db.commit()
-    db.refresh(comment)
-    # Reload comment with user relationship for proper serialization
-    comment = db.query(Comment).options(selectinload(Comment.user)).filter(Comment.id == comment.id).first()
-    comment.created_at = _to_ist(comment.created_at)
-    return comment
-
-
-@router.delete("/{shoutout_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_shoutout(
-    shoutout_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> None:
-    shout = db.get(ShoutOut, shoutout_id)
-    if not shout:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ShoutOut not found")
-    if not current_user.is_admin and shout.created_by_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to delete this shout-out")
-    user_deleted = not current_user.is_admin and shout.created_by_id == current_user.id
-    if user_deleted:
-        snippet = _truncate(shout.content or "", 80)
-        _notify_admins(
-            db,
-            actor=current_user,
-            event_type="shoutout_deleted",
-            message=f"{current_user.full_name} deleted their shout-out (#{shout.id}): \"{snippet}\"",
-        )
-    # Manually delete related rows to avoid FK violations
-    report_ids = [
-        rid for (rid,) in db.query(Report.id).filter(Report.shoutout_id == shoutout_id).all()
-    ]
-    if report_ids:
-        db.query(AdminNotification).filter(
-            or_(
-                AdminNotification.shoutout_id == shoutout_id,
-                AdminNotification.report_id.in_(report_ids),
-            )
-        ).delete(synchronize_session=False)
-    else:
-        db.query(AdminNotification).filter(
-            AdminNotification.shoutout_id == shoutout_id
-        ).delete(synchronize_session=False)
-    db.query(Report).filter(Report.shoutout_id == shoutout_id).delete(synchronize_session=False)
-    db.query(Notification).filter(Notification.shoutout_id == shoutout_id).delete(synchronize_session=False)
-    db.query(Comment).filter(Comment.shoutout_id == shoutout_id).delete(synchronize_session=False)
-    db.query(Reaction).filter(Reaction.shoutout_id == shoutout_id).delete(synchronize_session=False)
-    db.query(Attachment).filter(Attachment.shoutout_id == shoutout_id).delete(synchronize_session=False)
-    db.query(ShoutOutRecipient).filter(ShoutOutRecipient.shoutout_id == shoutout_id).delete(synchronize_session=False)
-    db.delete(shout)
-    db.commit()
-
-
-@router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_comment(
-    comment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> None:
-    comment = (
-        db.query(Comment)
-        .options(selectinload(Comment.user))
-        .filter(Comment.id == comment_id)
-        .first()
-    )
-    if not comment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
-    if not current_user.is_admin and comment.user_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to delete this comment")
-    user_deleted = not current_user.is_admin and comment.user_id == current_user.id
-    if user_deleted:
-        snippet = _truncate(comment.content or "", 80)
-        _notify_admins(
-            db,
-            actor=current_user,
-            event_type="comment_deleted",
-            message=f"{current_user.full_name} deleted a comment on shout-out #{comment.shoutout_id}: \"{snippet}\"",
-            shoutout_id=comment.shoutout_id,
-        )
-    db.delete(comment)
-    db.commit()
-
-
-@router.post("/{shoutout_id}/upload-image", response_model=schemas.AttachmentOut)
-async def upload_shoutout_image(
-    shoutout_id: int,
-    file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    """Upload an image attachment to a shoutout"""
-    shout = db.get(ShoutOut, shoutout_id)
-    if not shout:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ShoutOut not found"
-        )
-    
-    # Upload to Cloudinary
-    upload_result = await upload_image_to_cloudinary(file, folder="shoutouts")
-    
-    # Create attachment record
-    attachment = Attachment(
-        shoutout_id=shoutout_id,
-        file_url=upload_result["url"],
-        file_name=file.filename or "image",
-        file_type=file.content_type or "image/jpeg",
-    )
-    db.add(attachment)
-    db.commit()
-    db.refresh(attachment)
-    attachment.created_at = _to_ist(attachment.created_at)
-    return attachment
-
-
-@router.post("/{shoutout_id}/report", response_model=schemas.ReportOut, status_code=status.HTTP_201_CREATED)
-def report_shoutout(
-    shoutout_id: int,
-    data: schemas.ReportCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> schemas.ReportOut:
-    shout = (
-        db.query(ShoutOut)
-        .options(selectinload(ShoutOut.created_by))
-        .filter(ShoutOut.id == shoutout_id)
-        .first()
-    )
-    if not shout:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ShoutOut not found")
-    if shout.created_by_id == current_user.id:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You cannot report your own shout-out")
-    existing = (
-        db.query(Report)
-        .filter(
-            Report.shoutout_id == shoutout_id,
-            Report.reporter_id == current_user.id,
-            Report.status == "open",
-        )
-        .first()
-    )
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You have already reported this shout-out")
-    # Validation is handled by Pydantic schema
-    reason = data.reason.strip() if data.reason and data.reason.strip() else None
-    report = Report(
-        shoutout_id=shoutout_id,
-        reporter_id=current_user.id,
-        reason=reason,
-        status="open",
-    )
-    db.add(report)
-    db.flush()
-    reason_note = f" Reason: {reason}" if reason else ""
-    _notify_admins(
-        db,
-        actor=current_user,
-        event_type="report_submitted",
-        message=f"{current_user.full_name} reported shout-out #{shoutout_id}.{reason_note}",
-        shoutout_id=shoutout_id,
-        report_id=report.id,
-    )
-    db.commit()
-    report = (
-        db.query(Report)
-        .options(
-            selectinload(Report.shoutout).selectinload(ShoutOut.created_by),
-            selectinload(Report.reporter),
-            selectinload(Report.resolved_by),
-        )
-        .filter(Report.id == report.id)
-        .first()
-    )
-    return report
+import base64
+import binascii
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import exists, insert, text, tuple_
+from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+
+from .. import schemas
+from ..models import (
+    AdminNotification,
+    User,
+    ShoutOut,
+    ShoutOutRecipient,
+    Reaction,
+    Comment,
+    Attachment,
+    Report,
+    Notification,
+)
+from ..deps import get_current_user, get_db
+from ..cloudinary_utils import upload_image_to_cloudinary
+
+
+def _truncate(text: str, limit: int = 80) -> str:
+    clean = (text or "").strip()
+    if len(clean) <= limit:
+        return clean
+    return clean[: limit - 3].rstrip() + "..."
+
+
+def _notify_admins(
+    db: Session,
+    *,
+    actor: User,
+    event_type: str,
+    message: str,
+    shoutout_id: int | None = None,
+    report_id: int | None = None,
+) -> None:
+    note = AdminNotification(
+        event_type=event_type,
+        message=_truncate(message, 500),
+        actor_id=actor.id,
+        shoutout_id=shoutout_id,
+        report_id=report_id,
+    )
+    db.add(note)
+
+
+# IST is a fixed +05:30 offset with no DST, so a plain fixed-offset
+# timezone avoids ZoneInfo's transition-table lookup on every astimezone
+# call in the per-row conversion loops below.
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
+
+
+def _to_ist(dt: datetime | None) -> datetime | None:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(IST)
+
+
+router = APIRouter()
+
+# Built once at import: dumping the page through a shared TypeAdapter walks
+# the nested schema in one pydantic-core call instead of a Python-level
+# model_dump per shoutout, and avoids first-call schema build per worker.
+_SHOUTOUT_ADAPTER = TypeAdapter(schemas.ShoutOutOut)
+_SHOUTOUT_LIST_ADAPTER = TypeAdapter(List[schemas.ShoutOutOut])
+
+
+def _encode_cursor(created_at: datetime, shoutout_id: int) -> str:
+    payload = json.dumps({"created_at": created_at.isoformat(), "id": shoutout_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["created_at"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+# Response payloads below are assembled with model_construct: the values
+# come straight from the ORM and are already typed and constrained by the
+# database, so running the full validator tree per nested object on every
+# response is pure overhead. Untrusted input still validates normally.
+
+def _to_user_out(user: User, cache: dict[int, schemas.UserOut]) -> schemas.UserOut:
+    # The same few users author and receive most of a page's content, so
+    # each distinct user is constructed once per request; the adapter dumps
+    # the shared object at every position it appears.
+    cached = cache.get(user.id)
+    if cached is not None:
+        return cached
+    department = user.department
+    out = schemas.UserOut.model_construct(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        is_admin=user.is_admin,
+        avatar_url=user.avatar_url,
+        department=schemas.DepartmentOut.model_construct(
+            id=department.id,
+            name=department.name,
+            created_at=department.created_at,
+        ) if department else None,
+        created_at=user.created_at,
+    )
+    cache[user.id] = out
+    return out
+
+
+def _reaction_out(reaction: Reaction, user_cache: dict[int, schemas.UserOut]) -> schemas.ReactionOut:
+    return schemas.ReactionOut.model_construct(
+        id=reaction.id,
+        type=reaction.type,
+        user=_to_user_out(reaction.user, user_cache),
+        created_at=_to_ist(reaction.created_at),
+    )
+
+
+def _comment_out(comment: Comment, user_cache: dict[int, schemas.UserOut]) -> schemas.CommentOut:
+    return schemas.CommentOut.model_construct(
+        id=comment.id,
+        content=comment.content,
+        user=_to_user_out(comment.user, user_cache),
+        created_at=_to_ist(comment.created_at),
+        parent_id=comment.parent_id,
+    )
+
+
+def _attachment_out(attachment: Attachment) -> schemas.AttachmentOut:
+    return schemas.AttachmentOut.model_construct(
+        id=attachment.id,
+        file_url=attachment.file_url,
+        file_name=attachment.file_name,
+        file_type=attachment.file_type,
+        created_at=_to_ist(attachment.created_at),
+    )
+
+
+def _serialize_shoutout(shout: ShoutOut, user_cache: dict[int, schemas.UserOut]):
+    # Recipient users are batch-loaded with the parent query; a db.get per
+    # recipient here used to cost one SELECT per user per shoutout.
+    # IST conversion happens inside the construct helpers, so each row is
+    # walked exactly once and the ORM objects are never mutated.
+    return schemas.ShoutOutOut.model_construct(
+        id=shout.id,
+        content=shout.content,
+        department_id=shout.department_id,
+        created_at=_to_ist(shout.created_at),
+        created_by=_to_user_out(shout.created_by, user_cache),
+        recipients=[_to_user_out(r.user, user_cache) for r in shout.recipients],
+        reactions=[_reaction_out(r, user_cache) for r in shout.reactions],
+        comments=[_comment_out(c, user_cache) for c in shout.comments],
+        attachments=[_attachment_out(a) for a in shout.attachments],
+    )
+
+# Read-heavy endpoints return ORJSONResponse directly: the payload is
+# assembled once in _serialize_shoutout, so running it back through
+# response_model validation and jsonable_encoder would only re-walk data
+# we just built. `responses` keeps the shapes in the OpenAPI schema.
+@router.post("/", response_model=None, responses={200: {"model": schemas.ShoutOutOut}})
+def create_shoutout(
+    data: schemas.ShoutOutCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Validation is handled by Pydantic schema, but keeping for backward compatibility
+    if not data.recipient_ids or len(data.recipient_ids) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one recipient is required."
+        )
+    department_id = data.department_id or current_user.department_id
+    # RETURNING hands back the id and server-side created_at in the same
+    # round-trip, so nothing needs refreshing after commit.
+    shout_id, shout_created_at = db.execute(
+        insert(ShoutOut)
+        .values(
+            content=data.content,
+            department_id=department_id,
+            created_by_id=current_user.id,
+        )
+        .returning(ShoutOut.id, ShoutOut.created_at)
+    ).one()
+    recipient_ids = set(data.recipient_ids)
+    # Core executemany: one multi-row INSERT per table instead of ORM
+    # unit-of-work bookkeeping and a statement per recipient.
+    db.execute(
+        insert(ShoutOutRecipient),
+        [{"shoutout_id": shout_id, "user_id": rid} for rid in recipient_ids],
+    )
+    # Notify each recipient except the creator
+    notification_rows = [
+        {"shoutout_id": shout_id, "user_id": rid}
+        for rid in recipient_ids
+        if rid != current_user.id
+    ]
+    if notification_rows:
+        db.execute(insert(Notification), notification_rows)
+    # One SELECT for the recipient users; everything else in the response
+    # (author, empty reactions/comments/attachments) is already in hand,
+    # so the old reload-with-five-selectinloads query is gone.
+    recipient_users = (
+        db.query(User)
+        .options(joinedload(User.department))
+        .filter(User.id.in_(recipient_ids))
+        .all()
+    )
+    user_cache: dict[int, schemas.UserOut] = {}
+    shout_out = schemas.ShoutOutOut.model_construct(
+        id=shout_id,
+        content=data.content,
+        department_id=department_id,
+        created_at=_to_ist(shout_created_at),
+        created_by=_to_user_out(current_user, user_cache),
+        recipients=[_to_user_out(u, user_cache) for u in recipient_users],
+        reactions=[],
+        comments=[],
+        attachments=[],
+    )
+    # Dump before committing: expire_on_commit would otherwise expire
+    # current_user and the recipients loaded above, and serialization
+    # would re-SELECT each of them one by one.
+    payload = _SHOUTOUT_ADAPTER.dump_python(shout_out, mode="json")
+    db.commit()
+    return ORJSONResponse(payload)
+
+@router.get("/", response_model=None, responses={200: {"model": List[schemas.ShoutOutOut]}})
+def list_shoutouts(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    department: Optional[int] = Query(None),
+    sender: Optional[int] = Query(None),
+    recipient: Optional[int] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    has_attachments: Optional[bool] = Query(None),
+    limit: int = Query(50, le=100),
+    offset: int = Query(0),
+    cursor: Optional[str] = Query(None),
+):
+    # raiseload turns any relationship missed here into an error instead of
+    # a silent per-row lazy SELECT inside the serialization loop; the
+    # department legs are included because UserOut nests DepartmentOut.
+    q = db.query(ShoutOut).options(
+        selectinload(ShoutOut.created_by).joinedload(User.department),
+        selectinload(ShoutOut.recipients).selectinload(ShoutOutRecipient.user).joinedload(User.department),
+        selectinload(ShoutOut.reactions).selectinload(Reaction.user).joinedload(User.department),
+        selectinload(ShoutOut.comments).selectinload(Comment.user).joinedload(User.department),
+        selectinload(ShoutOut.attachments),
+        raiseload("*"),
+    )
+    if department:
+        q = q.filter(ShoutOut.department_id == department)
+    if sender:
+        q = q.filter(ShoutOut.created_by_id == sender)
+    if recipient:
+        # Semi-join via EXISTS: one index probe per candidate row and no
+        # join-induced row multiplication to dedupe.
+        q = q.filter(
+            exists().where(
+                ShoutOutRecipient.shoutout_id == ShoutOut.id,
+                ShoutOutRecipient.user_id == recipient,
+            )
+        )
+    if start_date:
+        q = q.filter(ShoutOut.created_at >= start_date)
+    if end_date:
+        q = q.filter(ShoutOut.created_at <= end_date)
+    if has_attachments is not None:
+        if has_attachments:
+            # Semi-join against the indexed attachments.shoutout_id column;
+            # DISTINCT collapses shoutouts with several attachments.
+            q = q.join(Attachment, Attachment.shoutout_id == ShoutOut.id).distinct()
+        else:
+            q = q.filter(~exists().where(Attachment.shoutout_id == ShoutOut.id))
+    # Allow all users to see shoutouts from all departments
+    # Department filtering is now handled by the department query parameter above
+    # Removed department restriction so users can see and interact with posts from all departments
+
+    # Keyset pagination: a cursor pins the page at (created_at, id) of the
+    # last row seen, so deep pages stay O(limit) instead of the database
+    # scanning and discarding `offset` rows. `offset` remains as a fallback
+    # for callers that have not adopted cursors yet.
+    q = q.order_by(ShoutOut.created_at.desc(), ShoutOut.id.desc())
+    if cursor:
+        last_created_at, last_id = _decode_cursor(cursor)
+        q = q.filter(tuple_(ShoutOut.created_at, ShoutOut.id) < tuple_(last_created_at, last_id))
+    elif offset:
+        q = q.offset(offset)
+    shoutouts = q.limit(limit).all()
+    user_cache: dict[int, schemas.UserOut] = {}
+    # The header must ride on the response we return: FastAPI only merges
+    # an injected Response's headers when the endpoint returns plain data,
+    # not when it returns a Response instance directly.
+    headers = {}
+    if len(shoutouts) == limit:
+        last = shoutouts[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
+    # Correct serialization for recipients
+    return ORJSONResponse(
+        _SHOUTOUT_LIST_ADAPTER.dump_python(
+            [_serialize_shoutout(so, user_cache) for so in shoutouts], mode="json"
+        ),
+        headers=headers,
+    )
+
+@router.post("/{shoutout_id}/react", response_model=None, responses={200: {"model": schemas.ReactionOut}})
+def react_to_shoutout(
+    shoutout_id: int,
+    data: schemas.ReactionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    author_id = db.query(ShoutOut.created_by_id).filter(ShoutOut.id == shoutout_id).scalar()
+    if author_id is None:
+        raise HTTPException(status_code=404, detail="ShoutOut not found")
+    # Toggle-off first: a second identical click deletes the row keyed by
+    # the unique (shoutout_id, user_id) pair plus the matching type.
+    removed = (
+        db.query(Reaction)
+        .filter_by(shoutout_id=shoutout_id, user_id=current_user.id, type=data.type)
+        .delete(synchronize_session=False)
+    )
+    if removed:
+        db.commit()
+        raise HTTPException(status_code=200, detail="Reaction removed.")
+    # Otherwise one upsert covers both first-reaction and changed-reaction:
+    # the unique constraint arbitrates, so there is no SELECT-then-write
+    # race and no separate insert/update branches.
+    row = db.execute(
+        pg_insert(Reaction)
+        .values(shoutout_id=shoutout_id, user_id=current_user.id, type=data.type)
+        .on_conflict_do_update(
+            constraint="uq_reaction_shoutout_user",
+            set_={"type": data.type},
+        )
+        .returning(Reaction.id, Reaction.created_at)
+    ).one()
+
+    # Notify the shoutout creator if they're not the one reacting; the
+    # unique (user_id, shoutout_id) constraint dedupes in the database, so
+    # there is no probe SELECT before the insert.
+    if author_id != current_user.id:
+        db.execute(
+            pg_insert(Notification)
+            .values(user_id=author_id, shoutout_id=shoutout_id)
+            .on_conflict_do_nothing(constraint="uq_notification_user_shoutout")
+        )
+
+    # The reacting user is current_user; no reload needed. Dump before
+    # committing so expire_on_commit does not force a refresh SELECT when
+    # serialization touches the expired instance.
+    reaction_out = schemas.ReactionOut.model_construct(
+        id=row.id,
+        type=data.type,
+        user=_to_user_out(current_user, {}),
+        created_at=_to_ist(row.created_at),
+    )
+    payload = reaction_out.model_dump(mode="json")
+    db.commit()
+    return ORJSONResponse(payload)
+
+@router.get("/{shoutout_id}/comments", response_model=None, responses={200: {"model": List[schemas.CommentOut]}})
+def get_shoutout_comments(
+    shoutout_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get all comments for a specific shoutout"""
+    # Column probe only: loading the ORM entity would also fire its four
+    # selectin collection loads just to check the row exists.
+    if db.query(ShoutOut.id).filter(ShoutOut.id == shoutout_id).scalar() is None:
+        raise HTTPException(status_code=404, detail="ShoutOut not found")
+
+    comments = db.query(Comment).options(
+        selectinload(Comment.user)
+    ).filter(Comment.shoutout_id == shoutout_id).order_by(Comment.created_at.asc()).all()
+    user_cache: dict[int, schemas.UserOut] = {}
+    
+    return ORJSONResponse(
+        [_comment_out(c, user_cache).model_dump(mode="json") for c in comments]
+    )
+
+
+@router.post("/{shoutout_id}/comment", response_model=None, responses={200: {"model": schemas.CommentOut}})
+def comment_on_shoutout(
+    shoutout_id: int,
+    data: schemas.CommentCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Add a comment to a shoutout"""
+    author_id = db.query(ShoutOut.created_by_id).filter(ShoutOut.id == shoutout_id).scalar()
+    if author_id is None:
+        raise HTTPException(status_code=404, detail="ShoutOut not found")
+
+    # Validation is handled by Pydantic schema
+    if not data.content or not data.content.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Comment content cannot be empty."
+        )
+    # Validate parent comment if provided
+    parent_id = data.parent_id
+    if parent_id is not None:
+        parent_shoutout_id = db.query(Comment.shoutout_id).filter(Comment.id == parent_id).scalar()
+        if parent_shoutout_id is None:
+            raise HTTPException(status_code=404, detail="Parent comment not found")
+        if parent_shoutout_id != shoutout_id:
+            raise HTTPException(status_code=400, detail="Parent comment mismatch for shoutout")
+
+    content = data.content.strip()
+    comment_id, comment_created_at = db.execute(
+        insert(Comment)
+        .values(
+            shoutout_id=shoutout_id,
+            user_id=current_user.id,
+            content=content,
+            parent_id=parent_id,
+        )
+        .returning(Comment.id, Comment.created_at)
+    ).one()
+
+    # Notify the shoutout creator if they're not the one commenting; the
+    # unique (user_id, shoutout_id) constraint dedupes in the database, so
+    # there is no probe SELECT before the insert.
+    if author_id != current_user.id:
+        db.execute(
+            pg_insert(Notification)
+            .values(user_id=author_id, shoutout_id=shoutout_id)
+            .on_conflict_do_nothing(constraint="uq_notification_user_shoutout")
+        )
+
+    # The commenting user is current_user; no reload needed. Dump before
+    # committing so expire_on_commit does not force a refresh SELECT when
+    # serialization touches the expired instance.
+    comment_out = schemas.CommentOut.model_construct(
+        id=comment_id,
+        content=content,
+        user=_to_user_out(current_user, {}),
+        created_at=_to_ist(comment_created_at),
+        parent_id=parent_id,
+    )
+    payload = comment_out.model_dump(mode="json")
+    db.commit()
+    return ORJSONResponse(payload)
+
+
+# All dependent rows and the shoutout itself go in one data-modifying CTE:
+# Postgres checks immediate FK constraints at end of statement, so the
+# ordering concerns that forced eight separate DELETEs (admin notifications
+# referencing reports, comments referencing comments, everything
+# referencing the shoutout) disappear, along with seven round-trips.
+# ON DELETE CASCADE on the FKs would be the schema-level fix, but the repo
+# manages its schema through create_all and has no migration tooling.
+_DELETE_SHOUTOUT_SQL = text(
+    """
+    WITH del_reports AS (
+        DELETE FROM reports WHERE shoutout_id = :sid RETURNING id
+    ), del_admin_notifications AS (
+        DELETE FROM admin_notifications
+        WHERE shoutout_id = :sid
+           OR report_id IN (SELECT id FROM del_reports)
+    ), del_notifications AS (
+        DELETE FROM notifications WHERE shoutout_id = :sid
+    ), del_comments AS (
+        DELETE FROM comments WHERE shoutout_id = :sid
+    ), del_reactions AS (
+        DELETE FROM reactions WHERE shoutout_id = :sid
+    ), del_attachments AS (
+        DELETE FROM attachments WHERE shoutout_id = :sid
+    ), del_recipients AS (
+        DELETE FROM shoutout_recipients WHERE shoutout_id = :sid
+    )
+    DELETE FROM shoutouts WHERE id = :sid
+    """
+)
+
+
+@router.delete("/{shoutout_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_shoutout(
+    shoutout_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    # Only the columns the permission check and audit note need; loading
+    # the full ORM object would also pull its selectin collections.
+    shout = (
+        db.query(ShoutOut.id, ShoutOut.content, ShoutOut.created_by_id)
+        .filter(ShoutOut.id == shoutout_id)
+        .first()
+    )
+    if not shout:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ShoutOut not found")
+    if not current_user.is_admin and shout.created_by_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to delete this shout-out")
+    user_deleted = not current_user.is_admin and shout.created_by_id == current_user.id
+    if user_deleted:
+        snippet = _truncate(shout.content or "", 80)
+        _notify_admins(
+            db,
+            actor=current_user,
+            event_type="shoutout_deleted",
+            message=f"{current_user.full_name} deleted their shout-out (#{shout.id}): \"{snippet}\"",
+        )
+    db.execute(_DELETE_SHOUTOUT_SQL, {"sid": shoutout_id})
+    db.commit()
+
+
+@router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_comment(
+    comment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    comment = (
+        db.query(Comment)
+        .options(selectinload(Comment.user))
+        .filter(Comment.id == comment_id)
+        .first()
+    )
+    if not comment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
+    if not current_user.is_admin and comment.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to delete this comment")
+    user_deleted = not current_user.is_admin and comment.user_id == current_user.id
+    if user_deleted:
+        snippet = _truncate(comment.content or "", 80)
+        _notify_admins(
+            db,
+            actor=current_user,
+            event_type="comment_deleted",
+            message=f"{current_user.full_name} deleted a comment on shout-out #{comment.shoutout_id}: \"{snippet}\"",
+            shoutout_id=comment.shoutout_id,
+        )
+    db.delete(comment)
+    db.commit()
+
+
+@router.post("/{shoutout_id}/upload-image", response_model=schemas.AttachmentOut)
+async def upload_shoutout_image(
+    shoutout_id: int,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Upload an image attachment to a shoutout"""
+    # Column probe only: loading the ORM entity would also fire its four
+    # selectin collection loads just to check the row exists.
+    if db.query(ShoutOut.id).filter(ShoutOut.id == shoutout_id).scalar() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ShoutOut not found"
+        )
+    
+    # Upload to Cloudinary
+    upload_result = await upload_image_to_cloudinary(file, folder="shoutouts")
+    
+    # Create attachment record
+    attachment = Attachment(
+        shoutout_id=shoutout_id,
+        file_url=upload_result["url"],
+        file_name=file.filename or "image",
+        file_type=file.content_type or "image/jpeg",
+    )
+    db.add(attachment)
+    db.commit()
+    db.refresh(attachment)
+    attachment.created_at = _to_ist(attachment.created_at)
+    return attachment
+
+
+@router.post(
+    "/{shoutout_id}/report",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": schemas.ReportOut}},
+)
+def report_shoutout(
+    shoutout_id: int,
+    data: schemas.ReportCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Only the author id is needed for the checks below; loading the full
+    # ShoutOut would also fire its four selectin collection loads.
+    author_id = db.query(ShoutOut.created_by_id).filter(ShoutOut.id == shoutout_id).scalar()
+    if author_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ShoutOut not found")
+    if author_id == current_user.id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You cannot report your own shout-out")
+    already_reported = db.query(
+        db.query(Report.id)
+        .filter(
+            Report.shoutout_id == shoutout_id,
+            Report.reporter_id == current_user.id,
+            Report.status == "open",
+        )
+        .exists()
+    ).scalar()
+    if already_reported:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You have already reported this shout-out")
+    # Validation is handled by Pydantic schema
+    reason = data.reason.strip() if data.reason and data.reason.strip() else None
+    report = Report(
+        shoutout_id=shoutout_id,
+        reporter_id=current_user.id,
+        reason=reason,
+        status="open",
+    )
+    db.add(report)
+    db.flush()
+    reason_note = f" Reason: {reason}" if reason else ""
+    _notify_admins(
+        db,
+        actor=current_user,
+        event_type="report_submitted",
+        message=f"{current_user.full_name} reported shout-out #{shoutout_id}.{reason_note}",
+        shoutout_id=shoutout_id,
+        report_id=report.id,
+    )
+    db.commit()
+    # Single-row relationships fold into the main SELECT; raiseload keeps
+    # the shoutout's mapper-level selectin collections (which ReportOut
+    # never serializes) from loading alongside it.
+    report = (
+        db.query(Report)
+        .options(
+            joinedload(Report.shoutout).joinedload(ShoutOut.created_by).joinedload(User.department),
+            joinedload(Report.reporter).joinedload(User.department),
+            joinedload(Report.resolved_by),
+            raiseload("*"),
+        )
+        .filter(Report.id == report.id)
+        .first()
+    )
+    return ORJSONResponse(
+        schemas.ReportOut.model_validate(report).model_dump(mode="json"),
+        status_code=status.HTTP_201_CREATED,
+    )
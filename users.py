@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import os
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status, UploadFile, File
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from .. import schemas
@@ -38,29 +41,63 @@ def _delete_avatar_file(url: str | None) -> None:
         target.unlink()
 
 
+def _users_etag(db: Session, department_id: int | None = None) -> str | None:
+    """Weak ETag derived from the newest updated_at in the (scoped) user set."""
+    q = db.query(func.max(User.updated_at))
+    if department_id is not None:
+        q = q.filter(User.department_id == department_id)
+    latest = q.scalar()
+    if latest is None:
+        return None
+    return f'W/"{int(latest.timestamp() * 1_000_000)}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    return request.headers.get("if-none-match") == etag
+
+
 @router.get("/me", response_model=schemas.UserOut)
 def me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+# User listings are polled by typeaheads; a MAX(updated_at) probe is far
+# cheaper than scanning and serializing the table, so clients that present
+# a current ETag get a 304 and skip the full query entirely.
+
 @router.get("/", response_model=list[schemas.UserOut])
-def list_users(_: User = Depends(require_admin), db: Session = Depends(get_db)):
+def list_users(request: Request, response: Response, _: User = Depends(require_admin), db: Session = Depends(get_db)):
+    etag = _users_etag(db)
+    if etag:
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        response.headers["ETag"] = etag
     return db.query(User).all()
 
 
 @router.get("/lookup", response_model=list[schemas.UserOut])
-def lookup_users(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def lookup_users(request: Request, response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     if current_user.is_admin:
-        return db.query(User).all()
+        department_id = None
     elif current_user.department_id is not None:
-        return db.query(User).filter(User.department_id == current_user.department_id).all()
+        department_id = current_user.department_id
     else:
         return [current_user]
+    etag = _users_etag(db, department_id)
+    if etag:
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        response.headers["ETag"] = etag
+    q = db.query(User)
+    if department_id is not None:
+        q = q.filter(User.department_id == department_id)
+    return q.all()
 
 
 @router.patch("/me", response_model=schemas.UserOut)
 def update_me(
     data: schemas.UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -87,7 +124,9 @@ def update_me(
         avatar_url = (payload["avatar_url"] or "").strip()
         new_value = avatar_url or None
         if new_value != current_user.avatar_url:
-            _delete_avatar_file(current_user.avatar_url)
+            # Unlink after the response is sent; a slow filesystem should
+            # not sit in the profile-update critical path.
+            background_tasks.add_task(_delete_avatar_file, current_user.avatar_url)
         current_user.avatar_url = new_value
         updated = True
 
@@ -119,6 +158,7 @@ def change_password(
 
 @router.post("/me/avatar", response_model=schemas.UserOut)
 async def upload_avatar(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -128,13 +168,17 @@ async def upload_avatar(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only JPEG, PNG, GIF, or WebP images are allowed.",
         )
-    contents = await file.read()
-    if not contents:
+    # Validate size by seeking the spooled temp file Starlette already holds
+    # instead of reading the whole avatar into a bytes object per upload.
+    source = file.file
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(0)
+    if size == 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty.")
-    if len(contents) > MAX_AVATAR_BYTES:
+    if size > MAX_AVATAR_BYTES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Avatar must be 5MB or smaller.")
 
-    await file.seek(0)
     try:
         upload_result = await upload_image_to_cloudinary(file, folder="avatars")
     finally:
@@ -147,7 +191,8 @@ async def upload_avatar(
             detail="Failed to upload avatar. Please try again.",
         )
 
-    _delete_avatar_file(current_user.avatar_url)
+    # Unlink the old file after the response is sent
+    background_tasks.add_task(_delete_avatar_file, current_user.avatar_url)
     current_user.avatar_url = avatar_url
 
     db.add(current_user)